@@ -9,12 +9,15 @@ def remove_a1111_special_syntax_chunks(s: str) -> tuple[str, list[str]]:
     Remove A1111 special syntax chunks from a string and return the string and the chunks.
     """
     chunks: list[str] = []
+    if "<" not in s:
+        # No special syntax possible; skip the regex pass
+        return s, chunks
 
     def put_chunk(m):
         chunks.append(m.group(0))
         return ""
 
-    return re.sub(A1111_SPECIAL_SYNTAX_RE, put_chunk, s), chunks
+    return A1111_SPECIAL_SYNTAX_RE.sub(put_chunk, s), chunks
 
 
 def append_chunks(s: str, chunks: list[str]) -> str:
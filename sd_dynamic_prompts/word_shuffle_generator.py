@@ -1,6 +1,9 @@
+import functools
 import random
 import re
+from collections.abc import Iterable
 
+from dynamicprompts.constants import DEFAULT_RANDOM
 from dynamicprompts.generators.promptgenerator import PromptGenerator
 
 from sd_dynamic_prompts.special_syntax import (
@@ -8,6 +11,161 @@ from sd_dynamic_prompts.special_syntax import (
     remove_a1111_special_syntax_chunks,
 )
 
+try:
+    import numpy as np
+except ImportError:  # only used to speed up shuffling very large sections
+    np = None
+
+# ~[ ]~ sections (DOTALL allows sections to span multiple lines)
+_SECTION_START = "~["
+_SECTION_RE = re.compile(r"~\[(.*?)\]~", re.DOTALL)
+
+# A comma following a section (possibly after whitespace)
+_COMMA_AHEAD_RE = re.compile(r"\s*,")
+
+# Priority prefix like ¤1, ¤2, etc.
+_PRIORITY_PREFIX = "¤"
+
+# Priorities below this are grouped in a list indexed by priority; larger
+# ones go in a dict, so a prefix like ¤99999 doesn't allocate a huge list.
+_MAX_INDEXED_PRIORITY = 100
+
+# Word groups at least this large are shuffled with NumPy (if available);
+# for smaller groups, setting up the NumPy generator costs more than it saves.
+_NUMPY_SHUFFLE_THRESHOLD = 256
+
+
+def _get_prompt_seeds(
+    seeds: list[int] | int | None,
+    num_prompts: int,
+) -> list[int | None]:
+    """
+    Get one seed (or None for unseeded) per prompt from the seeds passed to generate().
+    """
+    if isinstance(seeds, int):
+        seeds = [seeds]
+    if not seeds:
+        return [None] * num_prompts
+    if len(seeds) == 1:
+        return seeds * num_prompts
+    return list(seeds[:num_prompts]) + [None] * (num_prompts - len(seeds))
+
+
+@functools.lru_cache(maxsize=1024)
+def split_respecting_parentheses(text: str) -> tuple[str, ...]:
+    """
+    Split text by commas, but treat anything inside parentheses as a single unit.
+    For example: "happy, (very, very sad), joyful" -> ("happy", "(very, very sad)", "joyful")
+
+    Results are cached, since the same sections are split again for every image.
+    """
+    if "(" not in text and ")" not in text:
+        # Nothing to respect; a plain split gives the same result
+        return tuple(word for word in map(str.strip, text.split(",")) if word)
+
+    words = []
+    pending = []  # pieces of a word whose parentheses are still open
+    paren_depth = 0
+
+    # Split on every comma with str.split, then glue back together the pieces
+    # of words whose parentheses span a comma. This keeps the per-character
+    # work in (C-implemented) str methods instead of a Python loop.
+    # (Numba can't help here as it has next to no str support, and mapping
+    # characters to categories with str.translate would still leave a Python
+    # loop over every character.)
+    for piece in text.split(","):
+        if pending or "(" in piece or ")" in piece:
+            pending.append(piece)
+            paren_depth += piece.count("(") - piece.count(")")
+            if paren_depth:
+                continue
+            piece = ",".join(pending)
+            pending = []
+        word = piece.strip()
+        if word:
+            words.append(word)
+
+    # Don't forget a word whose parentheses were never closed
+    word = ",".join(pending).strip()
+    if word:
+        words.append(word)
+
+    return tuple(words)
+
+
+def _shuffle(words: list[str], rng: random.Random) -> list[str]:
+    """
+    Shuffle a freshly built list of words, possibly in place.
+    """
+    if np is None or len(words) < _NUMPY_SHUFFLE_THRESHOLD:
+        rng.shuffle(words)
+        return words
+    # Seed NumPy from `rng` so seeded shuffles stay reproducible
+    order = np.random.default_rng(rng.getrandbits(64)).permutation(len(words))
+    return [words[i] for i in order.tolist()]
+
+
+def _order_by_priority(words: Iterable[str], rng: random.Random) -> list[str]:
+    """
+    Order words by their priority prefix (¤1, ¤2, etc.), shuffling words of the
+    same priority among themselves. Words without a priority come last.
+    """
+    # Group words by priority
+    prioritized: list[list[str]] = []  # prioritized[n]: words with priority n
+    large_prioritized: dict[int, list[str]] = {}  # unusually large priorities
+    unprioritized = []  # words without priority
+
+    for word in words:
+        if word.startswith(_PRIORITY_PREFIX):
+            # Find the end of the priority number
+            end = 1
+            while end < len(word) and word[end].isdecimal():
+                end += 1
+            if end > 1:
+                priority = int(word[1:end])
+                if priority < _MAX_INDEXED_PRIORITY:
+                    if priority >= len(prioritized):
+                        prioritized.extend(
+                            [] for _ in range(priority - len(prioritized) + 1)
+                        )
+                    prioritized[priority].append(word[end:])
+                else:
+                    large_prioritized.setdefault(priority, []).append(word[end:])
+                continue
+        unprioritized.append(word)
+
+    # The groups are built fresh for every section, so they can be shuffled
+    # in place (which is also cheaper than rng.sample for short groups).
+    unprioritized = _shuffle(unprioritized, rng)
+    if not prioritized and not large_prioritized:
+        return unprioritized
+
+    # Build result by processing priorities in order
+    result = []
+
+    for group in prioritized:
+        if group:
+            result.extend(_shuffle(group, rng))
+
+    for priority in sorted(large_prioritized):
+        result.extend(_shuffle(large_prioritized[priority], rng))
+
+    # Add the (already shuffled) unprioritized words last
+    result.extend(unprioritized)
+
+    return result
+
+
+def _shuffle_section(content: str, rng: random.Random) -> str:
+    """
+    Shuffle the words of a single ~[ ]~ section (without the delimiters).
+    """
+    # Split by comma while respecting parentheses
+    words = split_respecting_parentheses(content)
+
+    # Rejoin with commas
+    return ", ".join(_order_by_priority(words, rng))
+
 
 class WordShuffleGenerator(PromptGenerator):
     """
@@ -28,95 +186,41 @@ class WordShuffleGenerator(PromptGenerator):
         prompts = self._generator.generate(template, num_images, **kwargs)
         if prompts is None:
             return None
-        return [self._shuffle_words(p) for p in prompts]
-
-    def _split_by_comma_respecting_parens(self, text: str) -> list[str]:
-        """
-        Split text by commas, but treat anything inside parentheses as a single unit.
-        For example: "happy, (very, very sad), joyful" -> ["happy", "(very, very sad)", "joyful"]
-        """
-        words = []
-        current_word = ""
-        paren_depth = 0
-
-        for char in text:
-            if char == "(":
-                paren_depth += 1
-                current_word += char
-            elif char == ")":
-                paren_depth -= 1
-                current_word += char
-            elif char == "," and paren_depth == 0:
-                # We're at a comma outside of parentheses, so split here
-                if current_word.strip():
-                    words.append(current_word.strip())
-                current_word = ""
-            else:
-                current_word += char
-
-        # Don't forget the last word
-        if current_word.strip():
-            words.append(current_word.strip())
-
-        return words
+        seeds = _get_prompt_seeds(kwargs.get("seeds"), len(prompts))
+        return [self._shuffle_words(p, seed) for p, seed in zip(prompts, seeds)]
 
-    def _shuffle_words(self, prompt: str) -> str:
+    def _shuffle_words(self, prompt: str, seed: int | None = None) -> str:
         """
         Shuffle words within ~[ ]~ sections while preserving A1111 special syntax.
         Words are split by commas only, and parentheses are respected.
         Supports multiline sections.
         Words with priority prefix (¤1, ¤2, etc.) are ordered by priority,
         with words of the same priority shuffled among themselves.
+        If a seed is given, the shuffle is reproducible for that seed.
         """
         # Remove A1111 special syntax first
         prompt, special_chunks = remove_a1111_special_syntax_chunks(prompt)
 
-        # Pattern to find ~[ ]~ sections (DOTALL flag allows matching across newlines)
-        pattern = r"~\[(.*?)\]~"
-
-        def shuffle_section(match):
-            content = match.group(1)
-
-            # Split by comma while respecting parentheses
-            words = self._split_by_comma_respecting_parens(content)
-
-            # Pattern to match priority prefix like ¤1, ¤2, etc.
-            priority_pattern = r"^¤(\d+)(.*)$"
-
-            # Group words by priority
-            prioritized = {}  # {priority_number: [words with that priority]}
-            unprioritized = []  # words without priority
-
-            for word in words:
-                match_priority = re.match(priority_pattern, word)
-                if match_priority:
-                    priority = int(match_priority.group(1))
-                    word_without_prefix = match_priority.group(2)
-                    if priority not in prioritized:
-                        prioritized[priority] = []
-                    prioritized[priority].append(word_without_prefix)
-                else:
-                    unprioritized.append(word)
-
-            # Build result by processing priorities in order
-            result = []
-
-            # Sort priority keys and process each group
-            for priority in sorted(prioritized.keys()):
-                group = prioritized[priority]
-                random.shuffle(group)
-                result.extend(group)
-
-            # Shuffle and add unprioritized words last
-            random.shuffle(unprioritized)
-            result.extend(unprioritized)
+        if _SECTION_START not in prompt:
+            # Nothing to shuffle
+            return append_chunks(prompt, special_chunks)
 
-            # Rejoin with commas
-            return ", ".join(result) + ","
+        # One random generator for all sections of the prompt
+        rng = random.Random(seed) if seed is not None else DEFAULT_RANDOM
 
         # Replace all ~[ ]~ sections with shuffled versions
-        # re.DOTALL makes . match newlines too
-        result = re.sub(pattern, shuffle_section, prompt, flags=re.DOTALL)
+        parts = []
+        last = 0
+        for m in _SECTION_RE.finditer(prompt):
+            parts.append(prompt[last : m.start()])
+            shuffled = _shuffle_section(m.group(1), rng)
+            parts.append(shuffled)
+            # The section is terminated by a comma, unless the prompt already has one
+            if shuffled and not _COMMA_AHEAD_RE.match(prompt, m.end()):
+                parts.append(",")
+            last = m.end()
+        parts.append(prompt[last:])
+        result = "".join(parts)
 
         # Restore A1111 special syntax
         return append_chunks(result, special_chunks)
@@ -0,0 +1,145 @@
+from dynamicprompts.generators import DummyGenerator
+
+from sd_dynamic_prompts.word_shuffle_generator import (
+    WordShuffleGenerator,
+    _get_prompt_seeds,
+    split_respecting_parentheses,
+)
+
+
+def test_shuffles_words_within_section():
+    generator = WordShuffleGenerator(DummyGenerator())
+    prompts = generator.generate("cat, ~[red, green, blue, yellow]~ painting", 20)
+
+    assert len(prompts) == 20
+    for prompt in prompts:
+        assert prompt.startswith("cat, ")
+        assert prompt.endswith(" painting")
+        section = prompt[len("cat, ") : -len(" painting")]
+        assert sorted(w.strip() for w in section.split(",") if w.strip()) == [
+            "blue",
+            "green",
+            "red",
+            "yellow",
+        ]
+    assert len(set(prompts)) > 1
+
+
+def test_parentheses_are_kept_together():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[happy, (very, very sad), joyful]~", 10):
+        assert "(very, very sad)" in prompt
+
+
+def test_priority_prefixes_are_ordered():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[c, ¤2b, ¤1a, d]~", 10):
+        assert prompt.startswith("a, b, ")
+        assert "¤" not in prompt
+
+
+def test_special_syntax_is_preserved():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[red, blue]~ cat <lora:loraname:0.7>", 5):
+        assert prompt.endswith("<lora:loraname:0.7>")
+
+
+def test_split_respecting_parentheses():
+    split = split_respecting_parentheses
+
+    assert split("happy, (very, very sad), joyful") == (
+        "happy",
+        "(very, very sad)",
+        "joyful",
+    )
+    assert split(" red,, green ,\nblue, ") == ("red", "green", "blue")
+    assert split("a, ((b, c), d), e") == ("a", "((b, c), d)", "e")
+    assert split("") == ()
+
+
+def test_seeded_shuffle_is_reproducible():
+    generator = WordShuffleGenerator(DummyGenerator())
+    template = "~[a, b, c, d, e, f]~ and ~[a, b, c, d, e, f]~"
+    seeds = list(range(10))
+
+    prompts = generator.generate(template, 10, seeds=seeds)
+    assert prompts == generator.generate(template, 10, seeds=seeds)
+    # Sections within a prompt are not all shuffled the same way
+    assert any(p.split(" and ")[0] != p.split(" and ")[1] for p in prompts)
+
+
+def test_get_prompt_seeds():
+    assert _get_prompt_seeds(None, 2) == [None, None]
+    assert _get_prompt_seeds(7, 2) == [7, 7]
+    assert _get_prompt_seeds([7], 2) == [7, 7]
+    # Generators may return a different number of prompts than seeds
+    assert _get_prompt_seeds([1, 2, 3, 4], 3) == [1, 2, 3]
+    assert _get_prompt_seeds([1, 2], 3) == [1, 2, None]
+
+
+def test_seeds_not_matching_prompt_count():
+    generator = WordShuffleGenerator(DummyGenerator())
+    template = "~[a, b, c, d, e, f]~"
+    expected = generator.generate(template, 3, seeds=[1, 2, 3])
+
+    # Extra seeds are ignored
+    assert generator.generate(template, 3, seeds=[1, 2, 3, 4]) == expected
+    # Prompts without a seed are still shuffled, just not reproducibly
+    prompts = generator.generate(template, 3, seeds=[1, 2])
+    assert prompts[:2] == expected[:2]
+    assert len(prompts) == 3
+
+
+def test_prompt_without_sections_is_unchanged():
+    generator = WordShuffleGenerator(DummyGenerator())
+    prompt = "red, green, blue <lora:loraname:0.7>"
+    assert generator.generate(prompt, 2) == [prompt, prompt]
+
+
+def test_large_priorities_are_ordered():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[d, ¤100000c, ¤0a, ¤150b, ¤99x]~", 10):
+        assert prompt.startswith("a, x, b, c, d")
+
+
+def test_multiline_word_with_priority_prefix():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[c, ¤1(a,\nb), d]~", 10):
+        assert prompt.startswith("(a,\nb), ")
+        assert "¤" not in prompt
+
+
+def test_priority_prefix_needs_a_number():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[¤10b, ¤2a, ¤c]~", 10):
+        assert prompt.startswith("a, b, ¤c")
+
+
+def test_section_comma_is_not_doubled():
+    generator = WordShuffleGenerator(DummyGenerator())
+    for prompt in generator.generate("~[red, blue]~ cat", 5):
+        assert prompt in ("red, blue, cat", "blue, red, cat")
+    for prompt in generator.generate("~[red, blue]~ , cat", 5):
+        assert prompt in ("red, blue , cat", "blue, red , cat")
+    assert generator.generate("~[ ]~ cat") == [" cat"]
+
+
+def test_large_section_is_shuffled():
+    generator = WordShuffleGenerator(DummyGenerator())
+    words = [f"word{i}" for i in range(1000)]
+    template = f"~[{', '.join(words)}]~"
+
+    prompts = generator.generate(template, 2, seeds=[1, 2])
+    assert prompts == generator.generate(template, 2, seeds=[1, 2])
+    for prompt in prompts:
+        shuffled = prompt.rstrip(",").split(", ")
+        assert shuffled != words
+        assert sorted(shuffled) == sorted(words)
+
+
+def test_split_respecting_unbalanced_parentheses():
+    split = split_respecting_parentheses
+
+    assert split("a, (b, c") == ("a", "(b, c")
+    assert split("a) , b, (c, d") == ("a) , b, (c", "d")
+    assert split(")a(, b") == (")a(", "b")
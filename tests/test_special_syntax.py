@@ -0,0 +1,22 @@
+from sd_dynamic_prompts.special_syntax import (
+    append_chunks,
+    remove_a1111_special_syntax_chunks,
+)
+
+
+def test_remove_and_append_chunks():
+    prompt, chunks = remove_a1111_special_syntax_chunks(
+        "cat <lora:loraname:0.7>, painting <hypernet:v18000Steps:1>",
+    )
+    assert prompt == "cat, painting"
+    assert chunks == [" <lora:loraname:0.7>", " <hypernet:v18000Steps:1>"]
+    assert append_chunks(prompt, chunks) == (
+        "cat, painting <lora:loraname:0.7> <hypernet:v18000Steps:1>"
+    )
+
+
+def test_remove_chunks_without_special_syntax():
+    assert remove_a1111_special_syntax_chunks("cat, painting") == (
+        "cat, painting",
+        [],
+    )